@@ -10,50 +10,118 @@ Functions:
      - document: The Document AI Document object containing the processed document data.
      - table_titles: A list of titles for each table extracted from the document.
    - Function Workflow:
-     - Initializes an empty list to store the JSON representation of each table.
-     - Iterates through each page and table in the document.
-     - Uses get_table_data to extract header and body rows from each table.
-     - Creates a Pandas DataFrame with the extracted data.
-     - Flattens MultiIndex column headers if present.
-     - Converts the DataFrame into a dictionary and adds the corresponding table title.
-     - Appends the table's JSON object to a list.
+     - Splits the flat title list into per-page slices matching each page's tables.
+     - Extracts the pages in parallel with a thread pool, one _extract_page call per page.
+     - Each page worker uses extract_table_rows to extract header and body rows from each table,
+       flattens multi-row headers into single column names joined with underscores, and encodes
+       the table straight to JSON bytes: the column names are JSON-encoded once per table and
+       each row pairs those keys with per-value C-encoder calls (orjson, or msgspec as a fallback).
+     - Flattens the per-page results into one list in document order.
    - Saving to JSON:
-     - Writes the list of table JSON objects to a file named 'table_data.json', using json.dump to serialize the data.
+     - Hands the encoded tables to a background thread that streams them to 'table_data.json' as NDJSON (one JSON
+       object per line) through a 64KB buffer, and returns the thread so callers can overlap the write with the next
+       document and join at shutdown.
 """
-from document_processing import get_table_data
-import pandas as pd
-import json
+from document_processing import extract_table_rows
+import concurrent.futures
+import os
+import threading
+
+# Prefer orjson for the value encoding; msgspec's C encoder is a close
+# second and takes the same single-argument, bytes-returning call shape
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    from msgspec.json import encode as _json_dumps
+
+
+def _encode_table(title, cols, rows):
+    """
+    Encodes one table as JSON bytes. The column names are fixed per table,
+    so their JSON form is encoded once and each row is emitted by pairing
+    the pre-encoded keys with per-value _json_dumps calls, skipping the
+    intermediate list-of-dicts entirely.
+    """
+    dumps = _json_dumps
+    col_keys = [dumps(col) for col in cols]
+    encoded_rows = [
+        b"{" + b",".join(key + b":" + dumps(value) for key, value in zip(col_keys, row)) + b"}"
+        for row in rows
+    ]
+    return (
+        b'{"Table Title":' + dumps(title)
+        + b',"Data":[' + b",".join(encoded_rows) + b"]}"
+    )
+
+
+def _extract_page(page, text, titles, cache):
+    """
+    Extracts every table on a single page as a list of encoded JSON byte
+    strings. titles holds the titles of this page's tables, in table
+    order; cache is the document-wide cell-text memo shared by all pages.
+    """
+    page_json = []
+    for i, table in enumerate(page.tables):
+        header_row_values, body_row_values = extract_table_rows(table, text, cache)
+
+        # Document AI sometimes returns tables with no header rows at
+        # all; fall back to positional names so the body rows survive
+        # instead of zipping against an empty column list
+        if not header_row_values:
+            width = max((len(row) for row in body_row_values), default=0)
+            cols = [f"col_{j}" for j in range(width)]
+        # Single header rows (the common case) are already the column
+        # names; only multi-row headers need the underscore-join flatten
+        elif len(header_row_values) == 1:
+            cols = header_row_values[0]
+        else:
+            cols = ['_'.join(map(str, tup)).strip() for tup in zip(*header_row_values)]
+
+        page_json.append(_encode_table(titles[i], cols, body_row_values))
+    return page_json
 
 
 def transform_and_save_data(document, table_titles):
-    json_data = []
-
-    for page in document.pages:
-        for i, table in enumerate(page.tables):
-            header_row_values = get_table_data(table.header_rows, document.text)
-            body_row_values = get_table_data(table.body_rows, document.text)
-
-            # Create a Pandas DataFrame
-            df = pd.DataFrame(
-                data=body_row_values,
-                columns=pd.MultiIndex.from_arrays(header_row_values),
-            )
-
-            # Flatten MultiIndex if present
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join(map(str, col)).strip() for col in df.columns.values]
-
-            # Convert DataFrame to a dictionary and add the table title
-            table_data = df.to_dict(orient='records')
-            table_json = {
-                "Table Title": table_titles[i],
-                "Data": table_data
-            }
-            
-            # Append this table's JSON to the list
-            json_data.append(table_json)
-
-    # Write the JSON data to a file
-    json_file_path = "table_data.json"
-    with open(json_file_path, 'w', encoding='utf-8') as file:
-        json.dump(json_data, file, ensure_ascii=False, indent=4)
+    text = document.text
+    pages = list(document.pages)
+
+    # table_titles is flat across the whole document; give each page
+    # worker the slice covering its own tables
+    title_slices = []
+    offset = 0
+    for page in pages:
+        count = len(page.tables)
+        title_slices.append(table_titles[offset:offset + count])
+        offset += count
+
+    # One cell-text memo per document: repeated cells (headers restated on
+    # every page, recurring labels) are sliced out of the text only once
+    cell_cache = {}
+
+    # Pages are independent, so extract them in parallel
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        page_results = list(executor.map(
+            _extract_page, pages, [text] * len(pages), title_slices, [cell_cache] * len(pages)
+        ))
+
+    json_data = [table_json for page_json in page_results for table_json in page_json]
+
+    # Hand the disk write to a background thread so the caller can start
+    # on the next document immediately; join the returned thread at
+    # pipeline shutdown to be sure the file is on disk.
+    writer = threading.Thread(target=_write_json, args=(json_data, "table_data.json"))
+    writer.start()
+    return writer
+
+
+def _write_json(json_data, json_file_path):
+    """
+    Writes the pre-encoded tables as NDJSON: one JSON object per line,
+    streamed through the write buffer. Peak memory stays one table, and
+    line-oriented consumers can load the file with
+    a json.loads() per line.
+    """
+    with open(json_file_path, 'wb', buffering=1 << 16) as file:
+        for table_json in json_data:
+            file.write(table_json)
+            file.write(b"\n")